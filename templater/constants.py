@@ -1,3 +1,6 @@
+import re
+
+
 class Case:
     Lower = "lower"
     LowerCamel = "lowerCamel"
@@ -30,3 +33,4 @@ SYMBOL_TEMPLATE = "@"
 SYMBOL_PATH_WILDCARD = "*"
 
 TOKEN_PATTERN = r"{(\W)?([\w\.]+)}"
+TOKEN_PATTERN_RE = re.compile(TOKEN_PATTERN)
@@ -1,4 +1,23 @@
-class FormatError(Exception):
+class _LazyMessageError(Exception):
+    """
+    Error whose message arguments are only formatted into the message when the
+    error is displayed, keeping errors used for control flow cheap to raise.
+    """
+
+    def __init__(self, message="", *format_args):
+        """
+        Args:
+            message: Error message, may contain str.format replacement fields
+            format_args: Values for the message's replacement fields
+        """
+        super().__init__(message, *format_args)
+
+    def __str__(self):
+        message, *format_args = self.args
+        return message.format(*format_args) if format_args else message
+
+
+class FormatError(_LazyMessageError):
     """Errors with formatting values into strings"""
 
 
@@ -6,15 +25,19 @@ class MissingTokenError(FormatError):
     """Errors with missing token fields"""
 
     def __init__(self, token_name):
-        super().__init__(f"Missing required token: {token_name}")
+        super().__init__("Missing required token: {}", token_name)
         self.token_name = token_name
 
+    def __reduce__(self):
+        # args holds the unformatted message, rebuild from the token name instead
+        return (self.__class__, (self.token_name,))
+
 
-class ParseError(Exception):
+class ParseError(_LazyMessageError):
     """Errors with parsing a string into values"""
 
 
-class ResolverError(Exception):
+class ResolverError(_LazyMessageError):
     """Errors raised with the TemplateResolver construction"""
 
 
@@ -6,6 +6,8 @@ from templater import constants, exceptions, template
 
 
 class PathTemplate(template.Template):
+    __slots__ = ()
+
     def extract_relative(self, path: str) -> Tuple[Dict[str, Any], str]:
         """
         Args:
@@ -75,10 +77,12 @@ class PathTemplate(template.Template):
             fields,
             unformatted={field: constants.SYMBOL_PATH_WILDCARD for field in wildcards or ()},
         )
+        # glob only lists directories for wildcarded components, fixed
+        # components are checked directly, so matches only need filtering
         for path in glob.iglob(path_string):
-            agnostic_path = path.replace("\\", "/")
             try:
-                fields = self.parse(agnostic_path)
+                # parse normalises the separators
+                fields = self.parse(path)
             except exceptions.ParseError:
                 continue
             else:
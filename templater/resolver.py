@@ -1,13 +1,35 @@
 from __future__ import annotations
 
+import collections
 import os
 import re
-from typing import Dict, Iterable, Iterator, Type
+import sys
+import threading
+import types
+from typing import Any, Dict, Iterable, Iterator, Pattern, Tuple, Type
 
 from templater import constants, exceptions, pathtemplate, template, token
 
+# Shared default for missing groups, avoids creating an empty dict per lookup
+_EMPTY_GROUP = types.MappingProxyType({})
+# Resolvers shared by from_config_cached, in least to most recently used order
+_CONFIG_CACHE = collections.OrderedDict()
+_CONFIG_CACHE_LOCK = threading.Lock()
+_CONFIG_CACHE_SIZE = 32
+# Named groups and backreferences in a template regex, ignoring escaped brackets
+_GROUP_NAME_REGEX = re.compile(r"(?<!\\)((?:\\\\)*)\(\?P([<=])(\w+)")
+
 
 class TemplateResolver:
+    __slots__ = (
+        "_tokens",
+        "_templates",
+        "_literal_pool",
+        "_group_regexes",
+        "_pending_templates",
+        "_read_only",
+    )
+
     @classmethod
     def from_config(cls, config: dict) -> TemplateResolver:
         """
@@ -21,21 +43,24 @@ class TemplateResolver:
         template_config = config[constants.KEY_TEMPLATES]
 
         resolver_obj = cls()
+        create_token = resolver_obj.create_token
+        create_template = resolver_obj.create_template
+        has_template = resolver_obj.has_template
 
         for token_name, token_data in token_config.items():
             if isinstance(token_data, str):
                 token_data = {constants.KEY_TYPE: token_data}
-            resolver_obj.create_token(token_name, token_data)
+            create_token(token_name, token_data)
 
         for group, type_data in template_config.items():
             for name, template_string in type_data.items():
                 # Referenced templates may be already loaded by parent templates
-                if not resolver_obj.has_template(group, name):
+                if not has_template(group, name):
                     kwargs = {}
                     if isinstance(template_string, dict):
-                        kwargs = template_string
+                        kwargs = dict(template_string)
                         template_string = kwargs.pop(constants.KEY_STRING)
-                    resolver_obj.create_template(
+                    create_template(
                         name,
                         group,
                         template_string,
@@ -45,6 +70,44 @@ class TemplateResolver:
 
         return resolver_obj
 
+    @classmethod
+    def from_config_cached(cls, config: dict) -> TemplateResolver:
+        """
+        Cached variant of `from_config`. The same resolver is returned for
+        every call with an equal config, so cached resolvers are read only and
+        raise a ResolverError from `create_template` and `create_token`. Use
+        `from_config` for a resolver that can be extended.
+
+        Args:
+            config: Dictionary containing token and template definitions
+
+        Returns:
+            Shared, read only resolver with the template configurations loaded
+        """
+        # The frozen config is only used as the key, the resolver is built from
+        # the config as given. Configs that can't be frozen are not cached.
+        try:
+            key = (cls, _freeze_config(config))
+            hash(key)
+        except TypeError:
+            return cls.from_config(config)
+
+        with _CONFIG_CACHE_LOCK:
+            resolver_obj = _CONFIG_CACHE.get(key)
+            if resolver_obj is not None:
+                _CONFIG_CACHE.move_to_end(key)
+                return resolver_obj
+
+        resolver_obj = cls.from_config(config)
+        resolver_obj._read_only = True
+        with _CONFIG_CACHE_LOCK:
+            # Another thread may have built the same config in the meantime
+            resolver_obj = _CONFIG_CACHE.setdefault(key, resolver_obj)
+            _CONFIG_CACHE.move_to_end(key)
+            while len(_CONFIG_CACHE) > _CONFIG_CACHE_SIZE:
+                _CONFIG_CACHE.popitem(last=False)
+        return resolver_obj
+
     def __init__(
         self,
         tokens: Iterable[token.Token] = None,
@@ -55,11 +118,20 @@ class TemplateResolver:
             tokens: Iterable of unique token objects
             templates: Iterable of unique template objects
         """
-        self._tokens = {t.name: t for t in tokens or ()}
+        # Names are interned as they're used as keys for all lookups
+        self._tokens = {sys.intern(t.name): t for t in tokens or ()}
         self._templates = {
-            group: {t.name: t for t in type_templates or ()}
+            sys.intern(group): {sys.intern(t.name): t for t in type_templates or ()}
             for group, type_templates in (templates or {}).items()
         }
+        # Shared storage for fixed strings, templates commonly repeat them
+        self._literal_pool = {}
+        # Combined regex for each group, built on first parse
+        self._group_regexes = {}
+        # Templates part way through creation, used to detect cyclic references
+        self._pending_templates = set()
+        # Set for resolvers shared by from_config_cached
+        self._read_only = False
 
     def create_template(
         self,
@@ -90,23 +162,26 @@ class TemplateResolver:
         Returns:
             Created template object stored in the resolver
         """
+        self._check_writable()
+        group = sys.intern(group)
+        template_name = sys.intern(template_name)
         if self.has_template(group, template_name):
             raise exceptions.ResolverError(f"Template '{group}.{template_name}' already exists")
 
         # Template configuration can define environment variables
         template_string = os.path.expandvars(string)
 
-        index = 0
+        # Splitting on the token pattern alternates the fixed strings with the
+        # captured groups, ie, [string, symbol, name, string, ..., string]
+        split_strings = constants.TOKEN_PATTERN_RE.split(template_string)
         segments = []
-        for match in re.finditer(constants.TOKEN_PATTERN, template_string):
-            # Extract fixed string segments between token/templates
-            start, end = match.span()
-            if start != index:
-                segments.append(template_string[index:start])
-            index = end
+        for fixed_string, symbol, name in zip(
+            split_strings[::3], split_strings[1::3], split_strings[2::3]
+        ):
+            if fixed_string:
+                segments.append(self._literal_pool.setdefault(fixed_string, fixed_string))
 
             # Find the matching referenced object
-            symbol, name = match.groups()
             if symbol == constants.SYMBOL_TEMPLATE:
                 sep_index = name.find(".")
                 if sep_index == -1:
@@ -121,9 +196,17 @@ class TemplateResolver:
                     ref_string = (reference_config or {}).get(subtype, {}).get(name)
                     if ref_string is None:
                         raise
-                    template_obj = self.create_template(
-                        name, subtype, ref_string, reference_config=reference_config
-                    )
+                    if (subtype, name) in self._pending_templates:
+                        raise exceptions.ResolverError(
+                            f"Cyclic reference to template '{subtype}.{name}'"
+                        )
+                    self._pending_templates.add((group, template_name))
+                    try:
+                        template_obj = self.create_template(
+                            name, subtype, ref_string, reference_config=reference_config
+                        )
+                    finally:
+                        self._pending_templates.discard((group, template_name))
                 segments.append(template_obj)
             elif not symbol:
                 token_obj = self.token(name)
@@ -132,12 +215,13 @@ class TemplateResolver:
                 raise exceptions.ResolverError(f"Unknown token symbol: {symbol}")
 
         # If it ends with a fixed string, ensure the remainder is added
-        last_string_segment = template_string[index:]
+        last_string_segment = split_strings[-1]
         if last_string_segment:
-            segments.append(last_string_segment)
+            segments.append(self._literal_pool.setdefault(last_string_segment, last_string_segment))
 
         template_obj = self._construct_template(group, template_name, segments, **kwargs)
         self._templates.setdefault(group, {})[template_name] = template_obj
+        self._group_regexes.pop(group, None)
         return template_obj
 
     def create_token(self, name: str, token_config: dict) -> token.Token:
@@ -152,6 +236,8 @@ class TemplateResolver:
         Returns:
             Created token object stored in the resolver
         """
+        self._check_writable()
+        name = sys.intern(name)
         if name in self._tokens:
             raise exceptions.ResolverError(f"Token '{name}' already exists")
 
@@ -160,6 +246,44 @@ class TemplateResolver:
         self._tokens[name] = token_obj
         return token_obj
 
+    def parse(self, group: str, string: str) -> Tuple[template.Template, Dict[str, Any]]:
+        """
+        Finds the first template in the group that matches the string. All of
+        the group's templates are matched in a single pass of a combined regex
+        rather than trying each template in turn, and the fields are converted
+        from that match by the tokens. Overrides of the template's parse
+        method are therefore not called.
+
+        Path templates accept either separator, as with PathTemplate.parse.
+
+        Raises:
+            exceptions.ParseError: If no template in the group matches the string
+
+        Args:
+            group: Type of templates to match against
+            string: String to parse
+
+        Returns:
+            Tuple of the matching template and the fields parsed by it
+        """
+        if group == constants.TEMPLATE_TYPE_PATH:
+            string = string.replace("\\", "/")
+
+        regex, templates = self._get_group_regex(group)
+        match = regex.fullmatch(string)
+        # An empty group's regex matches an empty string without any groups
+        if match is None or match.lastgroup is None:
+            raise exceptions.ParseError(
+                "String '{}' doesn't match any template in group '{}'", string, group
+            )
+
+        # The template's group encloses all the others, so it's closed last
+        template_obj, converters = templates[int(match.lastgroup[1:])]
+        fields = {
+            name: convert(match.group(group_name)) for group_name, name, convert in converters
+        }
+        return template_obj, fields
+
     def template(self, group: str, name: str) -> template.Template:
         """
         Raises:
@@ -169,9 +293,9 @@ class TemplateResolver:
             group: Type of template to get
             name: Name of the template to get
         """
-        template_obj = self._templates.get(group, {}).get(name)
+        template_obj = self._templates.get(group, _EMPTY_GROUP).get(name)
         if template_obj is None:
-            raise exceptions.ResolverError(f"Requested template name does not exist: {name}")
+            raise exceptions.ResolverError("Requested template name does not exist: {}", name)
         return template_obj
 
     def token(self, name: str) -> token.Token:
@@ -184,7 +308,7 @@ class TemplateResolver:
         """
         token_obj = self._tokens.get(name)
         if token_obj is None:
-            raise exceptions.ResolverError(f"Requested token name does not exist: {name}")
+            raise exceptions.ResolverError("Requested token name does not exist: {}", name)
         return token_obj
 
     def has_template(self, group: str, name: str) -> bool:
@@ -212,6 +336,15 @@ class TemplateResolver:
         """Iterates over all templates within a group"""
         return iter(self._templates[group].values())
 
+    def _check_writable(self):
+        """
+        Raises:
+            exceptions.ResolverError: If the resolver is shared by
+                `from_config_cached` and cannot be modified
+        """
+        if self._read_only:
+            raise exceptions.ResolverError("Cached resolvers are read only and cannot be modified")
+
     def _construct_template(self, group: str, name: str, segments, **kwargs) -> template.Template:
         """
         Args:
@@ -260,3 +393,62 @@ class TemplateResolver:
             description=description,
             default=default,
         )
+
+    def _get_group_regex(
+        self, group: str
+    ) -> Tuple[Pattern, Tuple[Tuple[template.Template, Tuple[Tuple[str, str, Any], ...]], ...]]:
+        """
+        Args:
+            group: Type of templates to combine
+
+        Returns:
+            Compiled regex matching any template in the group, and a tuple of
+                each template with its field converters in the order they're
+                matched. Each template's regex is wrapped in a group named
+                "t<index>", and its token groups are renamed to
+                "t<index>_<name>". Converters are tuples of the group name,
+                field name and conversion function.
+        """
+        group_regex = self._group_regexes.get(group)
+        if group_regex is None:
+            templates = []
+            regexes = []
+            for index, template_obj in enumerate(self._templates.get(group, _EMPTY_GROUP).values()):
+                # Prefix the token groups so that templates don't share names
+                regex = _GROUP_NAME_REGEX.sub(
+                    lambda match: f"{match.group(1)}(?P{match.group(2)}t{index}_{match.group(3)}",
+                    template_obj.regex(),
+                )
+                regexes.append(f"(?P<t{index}>{regex})")
+
+                # Duplicate tokens share a group, only convert each name once
+                unique_tokens = {t.name: t for t in template_obj.tokens()}
+                converters = tuple(
+                    (f"t{index}_{name}", name, token_obj.value_from_parsed_string)
+                    for name, token_obj in unique_tokens.items()
+                )
+                templates.append((template_obj, converters))
+            group_regex = self._group_regexes[group] = (
+                re.compile("|".join(regexes)),
+                tuple(templates),
+            )
+        return group_regex
+
+
+def _freeze_config(value: Any) -> Any:
+    """
+    Args:
+        value: Config value to freeze
+
+    Returns:
+        Hashable copy of the value, tagged with the value's type so that equal
+            values of different types, eg, 1 and "1", give different keys
+    """
+    if isinstance(value, dict):
+        return dict, frozenset((_freeze_config(k), _freeze_config(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(map(_freeze_config, value))
+    if isinstance(value, (set, frozenset)):
+        return type(value), frozenset(map(_freeze_config, value))
+    return type(value), value
+
@@ -1,11 +1,40 @@
 from __future__ import annotations
+import os
 import re
-from typing import Any, Dict, List, Tuple, Union
+import types
+from typing import Any, Dict, Iterable, Iterator, List, Match, Pattern, Set, Tuple, Union
 
-from templater import exceptions, token
+from templater import exceptions, token, util
+
+# Placeholder kinds, module level to keep lookups cheap when iterating
+KIND_TOKEN = 0
+KIND_TEMPLATE = 1
+KIND_UNKNOWN = 2
+
+# Shared default for optional field dictionaries, avoids creating one per call
+_EMPTY_FIELDS = types.MappingProxyType({})
 
 
 class Template:
+    __slots__ = (
+        "_name",
+        "_segments",
+        "_parts",
+        "_placeholders",
+        "_kinds",
+        "_escaped_parts",
+        "_flat_segments",
+        "_regex",
+        "_compiled_regex",
+        "_parse_tokens",
+        "_patterns",
+        "_fixed_strings",
+        "_child_templates",
+        "_tokens",
+        "_segment_regexes",
+        "_segment_group_regexes",
+    )
+
     def __init__(self, name: str, segments: List[Union[str, token.Token, Template]]):
         """
         Args:
@@ -13,10 +42,57 @@ class Template:
             segments: List of path segments
         """
         self._name = name
-        self._segments = segments
+        # Copied so that changes to the given list can't desync the caches
+        self._segments = tuple(segments)
+
+        # Split the segments into interleaved literal parts and placeholders,
+        # such that parts[i] precedes placeholders[i] and parts[-1] is the
+        # trailing literal, ie, len(parts) == len(placeholders) + 1. The kind of
+        # each placeholder is stored to avoid repeated isinstance checks.
+        # Child templates are also expanded once into a flat list of segments.
+        parts = []
+        placeholders = []
+        kinds = []
+        flat_segments = []
+        literal = []
+        for segment in segments:
+            if isinstance(segment, str):
+                literal.append(segment)
+                flat_segments.append(segment)
+                continue
+
+            if isinstance(segment, token.Token):
+                kinds.append(KIND_TOKEN)
+                flat_segments.append(segment)
+            elif isinstance(segment, Template):
+                kinds.append(KIND_TEMPLATE)
+                flat_segments.extend(segment._flat_segments)
+            else:
+                kinds.append(KIND_UNKNOWN)
+                flat_segments.append(segment)
+            parts.append("".join(literal))
+            placeholders.append(segment)
+            literal = []
+        parts.append("".join(literal))
+        self._parts = tuple(parts)
+        self._placeholders = tuple(placeholders)
+        self._kinds = tuple(kinds)
+        self._escaped_parts = tuple(map(re.escape, self._parts))
+        self._flat_segments = tuple(flat_segments)
+
+        # Lazily built on first use as invalid segments must only raise when used
+        self._regex = None
+        self._compiled_regex = None
+        self._parse_tokens = None
+        self._patterns = {}
+        self._fixed_strings = {}
+        self._child_templates = {}
+        self._tokens = {}
+        self._segment_regexes = {}
+        self._segment_group_regexes = None
 
     def __repr__(self):
-        return f"{self.__class__.__name__}({self._name!r}, {self._segments})"
+        return f"{self.__class__.__name__}({self._name!r}, {list(self._segments)})"
 
     def __str__(self):
         return ":".join((self._name, self.pattern()))
@@ -47,10 +123,26 @@ class Template:
             Tuple containing the dictionary of parsed fields and the index the
                 match finished on
         """
-        regex = self.regex()
-        fields, end = self._parse(regex, string)
+        fields, end = self._parse(string)
         return fields, end
 
+    def finditer(self, string: str) -> Iterator[Tuple[Dict[str, Any], Tuple[int, int]]]:
+        """
+        Finds all non-overlapping occurrences of the template in the string.
+
+        Raises:
+            exceptions.ParseError: If a matched value can't be converted
+
+        Args:
+            string: String to search for the template
+
+        Returns:
+            Iterator of tuples containing the dictionary of parsed fields and
+                the (start, end) indexes of the match
+        """
+        for match in self._get_compiled_regex().finditer(string):
+            yield self._fields_from_match(match), match.span()
+
     def fixed_strings(self, local_only: bool = False) -> List[str]:
         """
         Keyword Args:
@@ -60,9 +152,15 @@ class Template:
         Returns:
             List of string segments
         """
-        return [
-            segment for segment in self.segments(local_only=local_only) if isinstance(segment, str)
-        ]
+        fixed_strings = self._fixed_strings.get(local_only)
+        if fixed_strings is None:
+            fixed_strings = self._fixed_strings[local_only] = [
+                segment
+                for segment in (self._segments if local_only else self._flat_segments)
+                if isinstance(segment, str)
+            ]
+        # Copy so that callers can't modify the cached list
+        return list(fixed_strings)
 
     def format(
         self, fields: Dict[str, Any], unformatted: Dict[str, str] = None, use_defaults: bool = True
@@ -86,27 +184,33 @@ class Template:
         Returns:
             Formatted template string
         """
-        unformatted = unformatted or {}
-        segments = []
-        for segment in self._segments:
-            if isinstance(segment, str):
-                string_segment = segment
-            elif isinstance(segment, Template):
-                string_segment = segment.format(fields)
-            elif isinstance(segment, token.Token):
-                if segment.name in unformatted:
-                    string_segment = unformatted[segment.name]
-                elif segment.name not in fields:
-                    if use_defaults and segment.default is not None:
-                        string_segment = str(segment.default)
+        # Templates without tokens or child templates are a single literal
+        if not self._placeholders:
+            return self._parts[0]
+
+        if unformatted is None:
+            unformatted = _EMPTY_FIELDS
+        strings = [self._parts[0]]
+        for kind, placeholder, part in zip(self._kinds, self._placeholders, self._parts[1:]):
+            if kind == KIND_TEMPLATE:
+                string_segment = placeholder.format(
+                    fields, unformatted=unformatted, use_defaults=use_defaults
+                )
+            elif kind == KIND_TOKEN:
+                if placeholder.name in unformatted:
+                    string_segment = unformatted[placeholder.name]
+                elif placeholder.name not in fields:
+                    if use_defaults and placeholder.default is not None:
+                        string_segment = str(placeholder.default)
                     else:
-                        raise exceptions.MissingTokenError(segment.name)
+                        raise exceptions.MissingTokenError(placeholder.name)
                 else:
-                    string_segment = segment.format(fields[segment.name])
+                    string_segment = placeholder.format(fields[placeholder.name])
             else:
-                raise TypeError(f"Unknown segment type: {segment}")
-            segments.append(string_segment)
-        return "".join(segments)
+                raise TypeError(f"Unknown segment type: {placeholder}")
+            strings.append(string_segment)
+            strings.append(part)
+        return "".join(strings)
 
     def parse(self, string: str) -> Dict[str, Any]:
         """
@@ -120,8 +224,7 @@ class Template:
         Returns:
             Dictionary of fields extracted from the tokens
         """
-        regex = f"^{self.regex()}$"
-        fields, _ = self._parse(regex, string)
+        fields, _ = self._parse(string, full=True)
         return fields
 
     def parse_debug(self, string: str) -> Dict[str, Any]:
@@ -140,72 +243,106 @@ class Template:
             Dictionary of fields extracted from the tokens
         """
         segments = self.segments()
-        regexes = [
-            f"({segment if isinstance(segment, str) else segment.regex()})" for segment in segments
-        ]
         num_segments = len(segments)
 
-        for segment_index in range(num_segments, 0, -1):
-            pattern = "".join(regexes[:segment_index])
-            match = re.match(pattern, string)
+        # Find the largest number of leading segments that match the string.
+        # If a prefix of segments matches then every shorter prefix does too,
+        # so the full template is tried first and then bisected.
+        segment_index = num_segments
+        match = self._match_segments(segments, num_segments, string)
+        if match is None:
+            # Bisect between the segments known to match and those known not to
+            low, high = 0, num_segments - 1
+            while low < high:
+                middle = (low + high + 1) // 2
+                middle_match = self._match_segments(segments, middle, string)
+                if middle_match is None:
+                    high = middle - 1
+                else:
+                    low, match = middle, middle_match
             if match is None:
-                continue
+                raise exceptions.DebugParseError("String does not match at all", 0, 0, {})
+            segment_index = low
 
-            fields = {}
-            for i, (segment, value) in enumerate(zip(segments, match.groups())):
-                if isinstance(segment, str):
-                    continue
-
-                # group 0 is the entire string, add one to find the actual group
-                char_index, _ = match.span(i + 1)
-
-                try:
-                    value = segment.value_from_parsed_string(value)
-                except exceptions.ParseError as e:
-                    raise exceptions.DebugParseError(str(e), char_index, i, fields)
-
-                if segment.name in fields and fields[segment.name] != value:
-                    # Remove the invalid field before raising
-                    previous_value = fields.pop(segment.name)
-                    raise exceptions.MismatchTokenError(
-                        f"Mismatched values for token {{{segment.name}}}: {previous_value} != {value}",
-                        char_index,
-                        i,
-                        fields,
-                    )
-
-                fields[segment.name] = value
-
-            # Matched on the first pattern, ie, the whole template
-            if segment_index == num_segments:
-                if match.group(0) != string:
-                    _, end = match.span(0)
-                    raise exceptions.ExcessStringError(
-                        "Template matches string with remainder",
-                        end,
-                        num_segments,
-                        fields,
-                    )
-                return fields
-
-            segment = segments[segment_index]
-            char_index = match.end()
+        fields = {}
+        for i, (segment, value) in enumerate(zip(segments, match.groups())):
             if isinstance(segment, str):
-                for char_index, (a, b) in enumerate(
-                    zip(segment, string[char_index:]), start=char_index
-                ):
-                    if a != b:
-                        break
-
-            segname = f"'{segment}'" if isinstance(segment, str) else f"{{{segment.name}}}"
-            raise exceptions.DebugParseError(
-                f"Match fails at segment ({segment_index}) {segname}",
-                char_index,
-                segment_index,
-                fields,
-            )
+                continue
+
+            # group 0 is the entire string, add one to find the actual group
+            char_index, _ = match.span(i + 1)
+
+            try:
+                value = segment.value_from_parsed_string(value)
+            except exceptions.ParseError as e:
+                raise exceptions.DebugParseError(str(e), char_index, i, fields)
+
+            if segment.name in fields and fields[segment.name] != value:
+                # Remove the invalid field before raising
+                previous_value = fields.pop(segment.name)
+                raise exceptions.MismatchTokenError(
+                    f"Mismatched values for token {{{segment.name}}}: {previous_value} != {value}",
+                    char_index,
+                    i,
+                    fields,
+                )
+
+            fields[segment.name] = value
+
+        # Matched the whole template
+        if segment_index == num_segments:
+            if match.group(0) != string:
+                _, end = match.span(0)
+                raise exceptions.ExcessStringError(
+                    "Template matches string with remainder",
+                    end,
+                    num_segments,
+                    fields,
+                )
+            return fields
+
+        segment = segments[segment_index]
+        char_index = match.end()
+        if isinstance(segment, str):
+            # Point to the first character that differs from the fixed string
+            char_index += len(os.path.commonprefix((segment, string[char_index:])))
+
+        segname = f"'{segment}'" if isinstance(segment, str) else f"{{{segment.name}}}"
+        raise exceptions.DebugParseError(
+            f"Match fails at segment ({segment_index}) {segname}",
+            char_index,
+            segment_index,
+            fields,
+        )
+
+    def partial(self, fields: Dict[str, Any]) -> Template:
+        """
+        Creates a specialised template where the given fields are no longer
+        tokens, but fixed strings. Parsing with the specialised template is
+        cheaper, but only returns the remaining fields.
+
+        Raises:
+            exceptions.FormatError: If a value doesn't match its token
+
+        Args:
+            fields: Dictionary of token names mapped to values to fix
+
+        Returns:
+            New template of the same type with the fields formatted in
+        """
+        segments = []
+        for segment in self._segments:
+            if isinstance(segment, Template):
+                segment = segment.partial(fields)
+            elif isinstance(segment, token.Token) and segment.name in fields:
+                segment = segment.format(fields[segment.name])
 
-        raise exceptions.DebugParseError("String does not match at all", 0, 0, {})
+            # Merge adjacent fixed strings into a single segment
+            if isinstance(segment, str) and segments and isinstance(segments[-1], str):
+                segments[-1] += segment
+            else:
+                segments.append(segment)
+        return self.__class__(self._name, segments)
 
     def pattern(self, formatters: bool = False) -> str:
         """
@@ -220,45 +357,44 @@ class Template:
             Standard format string representing the template, eg,
                 word_{tokenA}_{tokenB}
         """
-        segments = []
-        for segment in self._segments:
-            if isinstance(segment, str):
-                string_segment = segment
-            elif isinstance(segment, token.Token):
+        pattern = self._patterns.get(formatters)
+        if pattern is not None:
+            return pattern
+
+        segments = [self._parts[0]]
+        for kind, placeholder, part in zip(self._kinds, self._placeholders, self._parts[1:]):
+            if kind == KIND_TOKEN:
                 if formatters:
-                    string_segment = f"{{{segment.name}:{segment.format_spec}}}"
+                    string_segment = f"{{{placeholder.name}:{placeholder.format_spec}}}"
                 else:
-                    string_segment = f"{{{segment.name}}}"
-            elif isinstance(segment, Template):
-                string_segment = segment.pattern(formatters=formatters)
+                    string_segment = f"{{{placeholder.name}}}"
+            elif kind == KIND_TEMPLATE:
+                string_segment = placeholder.pattern(formatters=formatters)
             else:
-                raise TypeError(f"Unknown segment type: {segment}")
+                raise TypeError(f"Unknown segment type: {placeholder}")
             segments.append(string_segment)
-        return "".join(segments)
+            segments.append(part)
+
+        pattern = self._patterns[formatters] = "".join(segments)
+        return pattern
 
-    def regex(self, backreferences: List[str] = None) -> str:
+    def regex(self, backreferences: Iterable[str] = None) -> str:
         """
+        Keyword Args:
+            backreferences: Token names that already have a named group
+                earlier in the regex. Tokens matching these names reference the
+                existing group instead of defining their own.
+
         Returns:
             Regex string for matching the entire template
         """
-        backreferences = backreferences or []
-        segments = []
-        for segment in self._segments:
-            if isinstance(segment, str):
-                pattern = re.escape(segment)
-            elif isinstance(segment, Template):
-                pattern = segment.regex(backreferences=backreferences)
-            elif isinstance(segment, token.Token):
-                if segment.name in backreferences:
-                    pattern = f"(?P={segment.name})"
-                else:
-                    pattern = f"(?P<{segment.name}>{segment.regex()})"
-                    backreferences.append(segment.name)
-            else:
-                raise TypeError(f"Unknown segment type: {segment}")
-            segments.append(pattern)
+        if backreferences is not None:
+            return self._build_regex(set(backreferences))
 
-        return "".join(segments)
+        # The standalone regex never changes, only build it once
+        if self._regex is None:
+            self._regex = self._build_regex(set())
+        return self._regex
 
     def segments(self, local_only: bool = False) -> List[Union[str, token.Token, Template]]:
         """
@@ -269,13 +405,7 @@ class Template:
         Returns:
             List of segments in the template
         """
-        segments = []
-        for segment in self._segments:
-            if isinstance(segment, Template) and not local_only:
-                segments.extend(segment.segments(local_only=local_only))
-            else:
-                segments.append(segment)
-        return segments
+        return list(self._segments if local_only else self._flat_segments)
 
     def templates(self, local_only: bool = False) -> List[Template]:
         """
@@ -285,14 +415,17 @@ class Template:
         Returns:
             List of all template segments
         """
-        templates = []
-        for segment in self._segments:
-            if isinstance(segment, Template):
-                templates.append(segment)
-                if not local_only:
-                    templates.extend(segment.templates(local_only=local_only))
-
-        return templates
+        templates = self._child_templates.get(local_only)
+        if templates is None:
+            templates = []
+            for kind, placeholder in zip(self._kinds, self._placeholders):
+                if kind == KIND_TEMPLATE:
+                    templates.append(placeholder)
+                    if not local_only:
+                        templates.extend(placeholder.templates(local_only=local_only))
+            self._child_templates[local_only] = templates
+        # Copy so that callers can't modify the cached list
+        return list(templates)
 
     def tokens(self, local_only: bool = False) -> List[token.Token]:
         """
@@ -303,21 +436,124 @@ class Template:
         Returns:
             List of token segments
         """
-        return [
-            segment
-            for segment in self.segments(local_only=local_only)
-            if isinstance(segment, token.Token)
-        ]
+        tokens = self._tokens.get(local_only)
+        if tokens is None:
+            tokens = self._tokens[local_only] = [
+                segment
+                for segment in (self._segments if local_only else self._flat_segments)
+                if isinstance(segment, token.Token)
+            ]
+        # Copy so that callers can't modify the cached list
+        return list(tokens)
+
+    def _build_regex(self, group_names: Set[str]) -> str:
+        """
+        Args:
+            group_names: Names of the groups already defined in the regex.
+                Updated with any groups this template defines.
 
-    def _parse(self, regex: str, string: str) -> Tuple[Dict[str, Any], int]:
-        match = re.match(regex, string)
-        if not match:
-            raise exceptions.ParseError(f"String '{string}' doesn't match template '{self}'")
+        Returns:
+            Regex string for matching the entire template
+        """
+        segments = [self._escaped_parts[0]]
+        for kind, placeholder, part in zip(
+            self._kinds, self._placeholders, self._escaped_parts[1:]
+        ):
+            if kind == KIND_TOKEN:
+                if placeholder.name in group_names:
+                    pattern = f"(?P={placeholder.name})"
+                else:
+                    pattern = f"(?P<{placeholder.name}>{placeholder.regex()})"
+                    group_names.add(placeholder.name)
+            elif kind == KIND_TEMPLATE:
+                pattern = placeholder._build_regex(group_names)
+            else:
+                raise TypeError(f"Unknown segment type: {placeholder}")
+            segments.append(pattern)
+            segments.append(part)
+
+        return "".join(segments)
+
+    def _get_compiled_regex(self) -> Pattern:
+        """
+        Returns:
+            Compiled regex for the template, built on first use
+        """
+        if self._compiled_regex is None:
+            self._compiled_regex = util.compile_regex(self.regex())
+        return self._compiled_regex
+
+    def _match_segments(
+        self, segments: List[Union[str, token.Token, Template]], count: int, string: str
+    ) -> Union[Match, None]:
+        """
+        Args:
+            segments: Flattened list of segments in the template
+            count: Number of leading segments to match
+            string: String to match against
+
+        Returns:
+            Match object with a group per segment, or None if the leading
+                segments don't match the start of the string
+        """
+        regex = self._segment_regexes.get(count)
+        if regex is None:
+            if self._segment_group_regexes is None:
+                # Escape each segment once for all the prefixes
+                self._segment_group_regexes = tuple(
+                    f"({re.escape(segment) if isinstance(segment, str) else segment.regex()})"
+                    for segment in segments
+                )
+            regex = self._segment_regexes[count] = util.compile_regex(
+                "".join(self._segment_group_regexes[:count])
+            )
+        return regex.match(string)
+
+    def _fields_from_match(self, match: Match) -> Dict[str, Any]:
+        """
+        Raises:
+            exceptions.ParseError: If a matched value can't be converted
+
+        Args:
+            match: Match object from one of the template's regexes
+
+        Returns:
+            Dictionary of fields converted to the token types
+        """
+        if self._parse_tokens is None:
+            # Duplicate tokens share a group, only convert each name once. The
+            # group numbering is the same for all regexes built for the template.
+            unique_tokens = {t.name: t for t in self.tokens()}
+            groupindex = match.re.groupindex
+            # Store the bound conversion methods to skip the lookup per parse
+            self._parse_tokens = tuple(
+                (groupindex[name] - 1, name, token_obj.value_from_parsed_string)
+                for name, token_obj in unique_tokens.items()
+            )
 
-        string_fields = match.groupdict()
         # Convert the string value to the token type
-        fields = {
-            token_obj.name: token_obj.value_from_parsed_string(string_fields[token_obj.name])
-            for token_obj in self.tokens()
-        }
-        return fields, match.end()
+        groups = match.groups()
+        return {name: convert(groups[index]) for index, name, convert in self._parse_tokens}
+
+    def _parse(self, string: str, full: bool = False) -> Tuple[Dict[str, Any], int]:
+        """
+        Raises:
+            exceptions.ParseError: If the string doesn't match the template
+
+        Args:
+            string: String to parse the template tokens from
+
+        Keyword Args:
+            full: Whether or not the template must match the entire string
+
+        Returns:
+            Tuple containing the dictionary of parsed fields and the index the
+                match finished on
+        """
+        regex = self._get_compiled_regex()
+        # fullmatch rather than anchoring with $, which allows a trailing newline
+        match = regex.fullmatch(string) if full else regex.match(string)
+        if not match:
+            raise exceptions.ParseError("String '{}' doesn't match template '{}'", string, self)
+
+        return self._fields_from_match(match), match.end()
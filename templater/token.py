@@ -1,10 +1,26 @@
-import re
+import sys
 from typing import Any
 
 from templater import constants, exceptions, util
 
 
+# Parsed values for short integer strings, avoids calling int() for the most
+# common values such as versions. Only canonical strings are included, padded
+# values like "001" fall back to int().
+_SMALL_INTS = {str(i): i for i in range(1000)}
+
+
 class Token:
+    __slots__ = (
+        "_name",
+        "_regex",
+        "_pattern",
+        "_format_spec",
+        "_description",
+        "_default",
+        "_validator",
+    )
+
     PADALIGN = ">"
     PADCHAR = "0"
     REGEX = "."
@@ -85,16 +101,22 @@ class Token:
                 value should be formatted
             default: Default value to use for the token if no value is provided
         """
-        self._name = name
-        self._pattern = re.compile(f"^{regex}$")
+        # Names are used as dictionary keys for all parsed/formatted fields
+        self._name = sys.intern(name)
+        self._regex = regex
+        # Compiled match method, bound on first use as tokens are often only
+        # used for formatting
+        self._pattern = None
+        # Simple regexes can be validated without a regex match
+        self._validator = util.get_regex_validator(regex)
         self._format_spec = format_spec
         self._description = description or ""
         self._default = default
 
     def __repr__(self) -> str:
         return (
-            f"{self.__class__.__name__}({self.name!r}, {self.regex()!r}, {self.format_spec!r}, "
-            f"description={self.description!r}, default={self.default})"
+            f"{self.__class__.__name__}({self._name!r}, {self._regex!r}, {self._format_spec!r}, "
+            f"description={self._description!r}, default={self._default})"
         )
 
     def __str__(self) -> str:
@@ -143,16 +165,18 @@ class Token:
         Returns:
             str: Formatted value
         """
-        formatter = "{:%s}" % self._format_spec
         try:
-            string = formatter.format(value)
+            # Equivalent to "{:spec}".format(value) without parsing the braces
+            string = format(value, self._format_spec)
         except ValueError:
-            raise exceptions.FormatError(f"Value {value!r} does not match {self!r}")
+            raise exceptions.FormatError("Value {!r} does not match {!r}", value, self)
 
         try:
             self.parse(string)
         except (ValueError, exceptions.ParseError):
-            raise exceptions.FormatError(f"Value as string {string!r} does not match {self!r}")
+            raise exceptions.FormatError(
+                "Value as string {!r} does not match {!r}", string, self
+            )
         return string
 
     def parse(self, string: str) -> Any:
@@ -166,9 +190,14 @@ class Token:
         Returns:
             Parsed value
         """
-        matched = self._pattern.match(string)
-        if matched is None:
-            raise exceptions.ParseError(f"String '{string}' does not match token {self!r}")
+        if self._validator is None:
+            if self._pattern is None:
+                self._pattern = util.compile_regex(self._regex).fullmatch
+            matched = self._pattern(string) is not None
+        else:
+            matched = self._validator(string)
+        if not matched:
+            raise exceptions.ParseError("String '{}' does not match token {!r}", string, self)
 
         value = self.value_from_parsed_string(string)
         return value
@@ -178,7 +207,7 @@ class Token:
         Returns:
             String pattern representing the regex
         """
-        return self._pattern.pattern[1:-1]
+        return self._regex
 
     def value_from_parsed_string(self, string: str) -> Any:
         """
@@ -189,6 +218,8 @@ class Token:
 
 
 class IntToken(Token):
+    __slots__ = ()
+
     PADALIGN = constants.DEFAULT_PADALIGN_INT
     PADCHAR = constants.DEFAULT_PADCHAR_INT
     REGEX = constants.REGEX_INT
@@ -257,15 +288,20 @@ class IntToken(Token):
         Returns:
             Integer value
         """
+        value = _SMALL_INTS.get(string)
+        if value is not None:
+            return value
         try:
             return int(string)
         except ValueError:
             raise exceptions.ParseError(
-                f"String '{string}' does not match int token '{self._name}'"
+                "String '{}' does not match int token '{}'", string, self._name
             )
 
 
 class StringToken(Token):
+    __slots__ = ()
+
     PADALIGN = constants.DEFAULT_PADALIGN_STR
     PADCHAR = constants.DEFAULT_PADCHAR_STR
     REGEX = constants.REGEX_STR
@@ -306,7 +342,8 @@ class StringToken(Token):
             Format spec for the token with the string "s" appended
         """
         # Enable strict padding by default unless set
-        config.setdefault("padstrict", True)
+        if "padstrict" not in config:
+            config = dict(config, padstrict=True)
         format_spec = super().get_format_spec_from_config(config)
         return format_spec + "s"
 
@@ -1,4 +1,6 @@
-from typing import TYPE_CHECKING
+import functools
+import re
+from typing import TYPE_CHECKING, Callable, Pattern, Union
 
 from templater import constants, exceptions
 
@@ -6,6 +8,51 @@ if TYPE_CHECKING:
     from templater.template import Template
 
 
+def _is_lower(string: str) -> bool:
+    return string.isalpha() and string.islower()
+
+
+def _is_upper(string: str) -> bool:
+    return string.isalpha() and string.isupper()
+
+
+# Unpadded regex patterns for each of the supported cases
+CASE_REGEXES = {
+    constants.Case.Lower: "[a-z]",
+    constants.Case.LowerCamel: "[a-z][a-zA-Z]",
+    constants.Case.Upper: "[A-Z]",
+    constants.Case.UpperCamel: "[A-Z][a-zA-Z]",
+}
+
+# Checks for the character classes used by generated token regexes. Strings are
+# checked to be ASCII first, so the checks only accept characters in the class.
+CHARACTER_CLASS_CHECKS = {
+    constants.REGEX_INT: str.isdecimal,
+    constants.REGEX_STR: str.isalpha,
+    "[a-z]": _is_lower,
+    "[A-Z]": _is_upper,
+}
+
+# A single character class with padding as generated by get_regex_padding,
+# optionally preceded by a single leading character class for camel cases
+SIMPLE_REGEX_PATTERN = re.compile(r"(\[[\w-]+\])?(\[[\w-]+\])(?:\+|\{(\d*),(\d*)\})")
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_regex(regex: str) -> Pattern:
+    """
+    Compiles a regex, sharing the compiled pattern between all templates and
+    tokens using the same regex.
+
+    Args:
+        regex: Regex pattern to compile
+
+    Returns:
+        Compiled regex pattern
+    """
+    return re.compile(regex)
+
+
 def format_string_debugger(
     template: "Template", string: str, debug_exc: exceptions.DebugParseError
 ) -> str:
@@ -20,20 +67,24 @@ def format_string_debugger(
     """
     segments = template.segments()
     if debug_exc.segment_index >= len(segments):
-        validate_message = [str(debug_exc)]
+        error_message = str(debug_exc)
     else:
         segment = segments[debug_exc.segment_index]
-        validate_message = [
+        error_message = (
             f"String '{segment}' does not match"
             if isinstance(segment, str)
             else f"Token '{segment.name}' does not match: {segment.description}"
-        ]
+        )
     prefix_string = "Pattern: "
     indent = len(prefix_string)
-    validate_message.append(f"{prefix_string}{template.pattern()}")
-    validate_message.append(" " * indent + string)
-    validate_message.append(" " * (indent + debug_exc.char_index) + "^")
-    return "\n".join(validate_message)
+    return "\n".join(
+        (
+            error_message,
+            f"{prefix_string}{template.pattern()}",
+            f"{' ' * indent}{string}",
+            "^".rjust(indent + debug_exc.char_index + 1),
+        )
+    )
 
 
 def get_case_regex(case: str) -> str:
@@ -44,20 +95,13 @@ def get_case_regex(case: str) -> str:
     Returns:
         Regex pattern for parsing the case - does not include padding
     """
-    if case == constants.Case.Lower:
-        regex = "[a-z]"
-    elif case == constants.Case.LowerCamel:
-        regex = "[a-z][a-zA-Z]"
-    elif case == constants.Case.Upper:
-        regex = "[A-Z]"
-    elif case == constants.Case.UpperCamel:
-        regex = "[A-Z][a-zA-Z]"
-    else:
+    regex = CASE_REGEXES.get(case)
+    if regex is None:
         raise exceptions.ResolverError(f"Unknown case: {case}")
-
     return regex
 
 
+@functools.lru_cache(maxsize=256)
 def get_regex_padding(padmin: int = None, padmax: int = None) -> str:
     """
     Gets a regex pattern for enforcing padding size on other patterns. Defaults
@@ -88,3 +132,86 @@ def get_regex_padding(padmin: int = None, padmax: int = None) -> str:
     else:
         padding_str = "+"
     return padding_str
+
+
+@functools.lru_cache(maxsize=1024)
+def get_regex_validator(regex: str) -> Union[Callable[[str], bool], None]:
+    """
+    Gets a function for checking if strings fully match a simple regex without
+    using a regex match, ie, a known character class with padding or an
+    alternation of plain strings.
+
+    Args:
+        regex: Regex pattern to get a validator for
+
+    Returns:
+        Function returning whether or not a string fully matches the regex, or
+            None if the regex is not simple enough
+    """
+    # Alternations of plain strings, eg, from token choices, are a set lookup
+    alternatives = regex.split("|")
+    if all(alternative and re.escape(alternative) == alternative for alternative in alternatives):
+        return frozenset(alternatives).__contains__
+
+    match = SIMPLE_REGEX_PATTERN.fullmatch(regex)
+    if match is None:
+        return None
+
+    leading_class, character_class, padmin, padmax = match.groups()
+    check = CHARACTER_CLASS_CHECKS.get(character_class)
+    if check is None:
+        return None
+
+    leading_check = None
+    if leading_class is not None:
+        leading_check = CHARACTER_CLASS_CHECKS.get(leading_class)
+        if leading_check is None:
+            return None
+
+    # Character class checks are always False for empty strings, so unpadded
+    # classes require at least one character
+    if padmin is None:
+        return _RegexValidator(check, 1, None, leading_check)
+
+    if not padmin and not padmax:
+        return None
+    minimum = int(padmin) if padmin else 0
+    maximum = int(padmax) if padmax else None
+    if maximum is not None and maximum < minimum:
+        return None
+
+    return _RegexValidator(check, minimum, maximum, leading_check)
+
+
+class _RegexValidator:
+    """
+    Checks strings against a padded character class with an optional leading
+    character class. A module level class, unlike a closure, can be pickled
+    with the tokens using it.
+    """
+
+    __slots__ = ("check", "minimum", "maximum", "leading_check")
+
+    def __init__(
+        self,
+        check: Callable[[str], bool],
+        minimum: int,
+        maximum: Union[int, None],
+        leading_check: Union[Callable[[str], bool], None] = None,
+    ):
+        self.check = check
+        self.minimum = minimum
+        self.maximum = maximum
+        self.leading_check = leading_check
+
+    def __call__(self, string: str) -> bool:
+        if self.leading_check is not None:
+            first = string[:1]
+            if not (first.isascii() and self.leading_check(first)):
+                return False
+            string = string[1:]
+
+        length = len(string)
+        if length < self.minimum or (self.maximum is not None and length > self.maximum):
+            return False
+        return length == 0 or (string.isascii() and self.check(string))
@@ -0,0 +1,27 @@
+import pickle
+
+import pytest
+
+from templater import exceptions
+
+
+def test_missing_token_error__pickle():
+    error = pickle.loads(pickle.dumps(exceptions.MissingTokenError("int")))
+    assert isinstance(error, exceptions.MissingTokenError)
+    assert error.token_name == "int"
+    assert str(error) == "Missing required token: int"
+
+
+def test_parse_error__pickle():
+    error = pickle.loads(pickle.dumps(exceptions.ParseError("String '{}' doesn't match", "abc")))
+    assert str(error) == "String 'abc' doesn't match"
+
+
+@pytest.mark.parametrize(
+    "error_type", [exceptions.FormatError, exceptions.ParseError, exceptions.ResolverError]
+)
+def test_no_arguments(error_type):
+    error = error_type()
+    assert str(error) == ""
+    with pytest.raises(error_type):
+        raise error
@@ -1,3 +1,5 @@
+import concurrent.futures
+
 import mock
 import pytest
 
@@ -275,3 +277,137 @@ def test_has_token():
     resolver_obj = resolver.TemplateResolver(tokens=[int_token])
     assert resolver_obj.has_token("int")
     assert not resolver_obj.has_token("missing")
+
+
+def test_from_config_cached():
+    config = {
+        "tokens": {"str": {"type": "str"}, "int": "int"},
+        "templates": {"string": {"root": {"string": "{str}_{int}"}}},
+    }
+    resolver_obj = resolver.TemplateResolver.from_config_cached(config)
+    assert resolver_obj.template("string", "root").parse("abc_1") == {"str": "abc", "int": 1}
+
+    # The config must not be modified by loading, and equal configs share a resolver
+    assert config["templates"]["string"]["root"] == {"string": "{str}_{int}"}
+    assert config["tokens"]["str"] == {"type": "str"}
+    assert resolver.TemplateResolver.from_config_cached(config) is resolver_obj
+    assert resolver.TemplateResolver.from_config_cached(dict(config)) is resolver_obj
+
+    # Shared resolvers can't be modified by one caller for all others
+    with pytest.raises(exceptions.ResolverError):
+        resolver_obj.create_token("other", {"type": "str"})
+    with pytest.raises(exceptions.ResolverError):
+        resolver_obj.create_template("other", "string", "{str}")
+    assert not resolver_obj.has_token("other")
+    assert not resolver_obj.has_template("string", "other")
+
+    # Uncached resolvers can still be extended
+    resolver.TemplateResolver.from_config(config).create_token("other", {"type": "str"})
+
+
+def test_from_config_cached__original_config():
+    # The resolver is built from the given config, not a JSON round trip of it
+    config = {
+        "tokens": {"str": {"type": "str", "choices": ("abc", "def")}},
+        "templates": {"string": {"root": "{str}"}},
+    }
+    resolver_obj = resolver.TemplateResolver.from_config_cached(config)
+    assert resolver_obj.token("str").description == "Must be one of: ('abc', 'def')"
+
+
+def test_from_config_cached__key_types():
+    def get_config(choices):
+        return {
+            "tokens": {"str": {"type": "str", "choices": choices}},
+            "templates": {"string": {"root": "{str}"}},
+        }
+
+    # Mixed key types can't be sorted, equal keys of different types must not
+    # share a resolver
+    mixed = resolver.TemplateResolver.from_config_cached(get_config({1: "a", "b": 2}))
+    assert mixed.token("str").description == "Must be one of: {1: 'a', 'b': 2}"
+    int_keys = resolver.TemplateResolver.from_config_cached(get_config({1: "a"}))
+    str_keys = resolver.TemplateResolver.from_config_cached(get_config({"1": "a"}))
+    assert int_keys is not str_keys
+    assert int_keys.token("str").description == "Must be one of: {1: 'a'}"
+    assert str_keys.token("str").description == "Must be one of: {'1': 'a'}"
+
+
+def test_from_config_cached__threads():
+    configs = [
+        {"tokens": {"str": "str"}, "templates": {"string": {str(i): "{str}"}}} for i in range(64)
+    ]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        resolvers = list(executor.map(resolver.TemplateResolver.from_config_cached, configs * 4))
+    assert all(isinstance(resolver_obj, resolver.TemplateResolver) for resolver_obj in resolvers)
+
+
+def test_create_template__shared_fixed_strings():
+    resolver_obj = resolver.TemplateResolver(tokens=[token.StringToken("str")])
+    template_a = resolver_obj.create_template("a", "string", "/root/{str}/file")
+    template_b = resolver_obj.create_template("b", "string", "/root/{str}/other")
+    assert template_a.segments()[0] is template_b.segments()[0]
+
+
+def test_parse():
+    resolver_obj = resolver.TemplateResolver.from_config(
+        {
+            "tokens": {"str": "str", "int": "int"},
+            "templates": {
+                "string": {
+                    "root": "{str}_{int}",
+                    "repeat": "{str}_{str}",
+                    "child": "{@root}_{str}",
+                    "literal": "(?P<str>abc)",
+                }
+            },
+        }
+    )
+    root = resolver_obj.template("string", "root")
+    repeat = resolver_obj.template("string", "repeat")
+    child = resolver_obj.template("string", "child")
+    literal = resolver_obj.template("string", "literal")
+    assert resolver_obj.parse("string", "abc_1") == (root, {"str": "abc", "int": 1})
+    assert resolver_obj.parse("string", "abc_abc") == (repeat, {"str": "abc"})
+    assert resolver_obj.parse("string", "abc_1_abc") == (child, {"str": "abc", "int": 1})
+    assert resolver_obj.parse("string", "(?P<str>abc)") == (literal, {})
+
+    with pytest.raises(exceptions.ParseError):
+        resolver_obj.parse("string", "abc_def")
+    with pytest.raises(exceptions.ParseError):
+        resolver_obj.parse("string", "abc_1_")
+    with pytest.raises(exceptions.ParseError):
+        resolver_obj.parse("string", "abc_1\n")
+    with pytest.raises(exceptions.ParseError):
+        resolver_obj.parse("missing", "")
+
+    # Adding a template to the group must include it in the next parse
+    extra = resolver_obj.create_template("extra", "string", "{int}")
+    assert resolver_obj.parse("string", "1") == (extra, {"int": 1})
+
+
+@pytest.mark.parametrize(
+    "templates, expected",
+    [
+        ({"a": "{@a}"}, "Cyclic reference to template 'string.a'"),
+        ({"a": "{@b}", "b": "{@a}"}, "Cyclic reference to template 'string.a'"),
+        ({"a": "{@b}", "b": "{@c}", "c": "{@b}"}, "Cyclic reference to template 'string.b'"),
+    ],
+)
+def test_from_config__cyclic_reference(templates, expected):
+    with pytest.raises(exceptions.ResolverError) as exc_info:
+        resolver.TemplateResolver.from_config({"tokens": {}, "templates": {"string": templates}})
+    assert str(exc_info.value) == expected
+
+
+def test_parse__path():
+    resolver_obj = resolver.TemplateResolver.from_config(
+        {
+            "tokens": {"str": "str", "int": "int"},
+            "templates": {constants.TEMPLATE_TYPE_PATH: {"version": "/root/{str}/v{int}"}},
+        }
+    )
+    version = resolver_obj.template(constants.TEMPLATE_TYPE_PATH, "version")
+    expected = (version, {"str": "abc", "int": 1})
+    assert resolver_obj.parse(constants.TEMPLATE_TYPE_PATH, "/root/abc/v1") == expected
+    assert resolver_obj.parse(constants.TEMPLATE_TYPE_PATH, "\\root\\abc\\v1") == expected
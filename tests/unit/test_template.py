@@ -27,6 +27,13 @@ class TestTemplate(object):
         t.segments()[0] = "ghi"
         assert t.segments() == ["abc", "def"]
 
+        # Modifying the list the template was created from must not affect it
+        segments = ["abc", "def"]
+        t = template.Template("name", segments)
+        segments.append("ghi")
+        assert t.segments() == ["abc", "def"]
+        assert t.format({}) == "abcdef"
+
     @pytest.mark.parametrize(
         "segments, string, expected_fields, expected_end",
         [
@@ -85,6 +92,14 @@ class TestTemplate(object):
         with pytest.raises(TypeError):
             t.extract("abc1")
 
+    def test_finditer(self):
+        t = template.Template("name", ["v", token.IntToken("int"), "_", token.StringToken("str")])
+        assert list(t.finditer("abc v1_a, v_b v20_xyz")) == [
+            ({"int": 1, "str": "a"}, (4, 8)),
+            ({"int": 20, "str": "xyz"}, (14, 21)),
+        ]
+        assert list(t.finditer("abc")) == []
+
     @pytest.mark.parametrize(
         "segments, local_only, expected",
         [
@@ -136,6 +151,17 @@ class TestTemplate(object):
                 {"int": "*"},
                 "*_word",
             ),
+            # Wildcards in child templates
+            (
+                [
+                    template.Template("child", ["prefix_", token.StringToken("str")]),
+                    "_",
+                    token.IntToken("int"),
+                ],
+                {"int": 1},
+                {"str": "*"},
+                "prefix_*_1",
+            ),
             # Defaults
             (
                 [
@@ -173,6 +199,12 @@ class TestTemplate(object):
             t.format({"int": 1})
         assert exc_info.value.token_name == "str"
 
+        # Child templates must not fall back to defaults either
+        t = template.Template("parent", [t, "_", token.StringToken("other")])
+        with pytest.raises(exceptions.MissingTokenError) as exc_info:
+            t.format({"str": "abc", "other": "def"}, use_defaults=False)
+        assert exc_info.value.token_name == "int"
+
     @pytest.mark.parametrize(
         "segments, string, expected",
         [
@@ -211,6 +243,10 @@ class TestTemplate(object):
         with pytest.raises(exceptions.ParseError):
             t.parse("abc_10")
 
+        # Trailing newline
+        with pytest.raises(exceptions.ParseError):
+            t.parse("abc10\n")
+
         # incomplete match has trailing string "def"
         with pytest.raises(exceptions.ParseError):
             t.parse("abc10def")
@@ -354,6 +390,8 @@ class TestTemplate(object):
             ("abc_center_123", exceptions.DebugParseError, 11, 2, {"prefix": "abc"}),
             # Partial fixed string match
             ("abc_centre_def", exceptions.DebugParseError, 8, 1, {"prefix": "abc"}),
+            # String ends part way through the fixed string
+            ("abc_cen", exceptions.DebugParseError, 7, 1, {"prefix": "abc"}),
         ],
     )
     def test_parse_debug_error_3(
@@ -375,6 +413,40 @@ class TestTemplate(object):
         assert exc_info.value.segment_index == expected_segment_index
         assert exc_info.value.fields == expected_fields
 
+    def test_parse_debug_escapes_fixed_strings(self):
+        t = template.Template("name", [token.StringToken("name"), ".", token.IntToken("int")])
+        assert t.parse_debug("abc.1") == {"name": "abc", "int": 1}
+
+        # "." is a fixed string, not a regex wildcard
+        with pytest.raises(exceptions.DebugParseError) as exc_info:
+            t.parse_debug("abc_1")
+        assert exc_info.value.char_index == 3
+        assert exc_info.value.segment_index == 1
+
+    def test_partial(self):
+        int_token = token.IntToken("int", format_spec="03d")
+        child = template.Template("child", [token.StringToken("str"), "_"])
+        t = template.Template("name", [child, int_token])
+
+        partial = t.partial({"str": "abc"})
+        assert partial.name == "name"
+        assert partial.pattern() == "abc_{int}"
+        assert partial.segments(local_only=True) == [
+            template.Template("child", ["abc_"]),
+            int_token,
+        ]
+        assert partial.parse("abc_001") == {"int": 1}
+        with pytest.raises(exceptions.ParseError):
+            partial.parse("def_001")
+
+        assert t.partial({"str": "abc", "int": 1}).pattern() == "abc_001"
+        assert template.Template("name", ["a", token.IntToken("int"), "c"]).partial(
+            {"int": 2}
+        ).segments() == ["a2c"]
+
+        with pytest.raises(exceptions.FormatError):
+            t.partial({"int": "abc"})
+
     @pytest.mark.parametrize(
         "segments, formatters, expected",
         [
@@ -430,6 +502,11 @@ class TestTemplate(object):
                 [token.IntToken("int"), "_", token.IntToken("int")],
                 r"(?P<int>[0-9]+)_(?P=int)",
             ),
+            # Leading child template defines the group for the parent's token
+            (
+                [template.Template("child", [token.IntToken("int")]), "_", token.IntToken("int")],
+                r"(?P<int>[0-9]+)_(?P=int)",
+            ),
         ],
     )
     def test_regex(self, segments, expected):
@@ -475,3 +552,7 @@ class TestTemplate(object):
         t3 = template.Template("t3", [s_token, t2, i_token])
         assert t3.tokens(local_only=True) == [s_token, i_token]
         assert t3.tokens(local_only=False) == [s_token, s_token, i_token]
+
+        # Results are cached, but modifying the returned list mustn't affect it
+        t3.tokens().append(s_token)
+        assert t3.tokens(local_only=False) == [s_token, s_token, i_token]
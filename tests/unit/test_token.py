@@ -1,6 +1,8 @@
+import pickle
+
 import pytest
 
-from templater import exceptions, token
+from templater import exceptions, template, token
 
 
 class TestToken(object):
@@ -33,8 +35,12 @@ class TestToken(object):
         t = token.Token("name", "[a-zA-Z]+", "")
         assert t.format("abc") == "abc"
 
-        with pytest.raises(exceptions.FormatError):
+        with pytest.raises(exceptions.FormatError) as exc_info:
             t.format("123")
+        assert str(exc_info.value) == (
+            "Value as string '123' does not match "
+            "Token('name', '[a-zA-Z]+', '', description='', default=None)"
+        )
 
     def test_format_spec(self):
         t = token.Token("name", "[a-z]", "")
@@ -47,6 +53,19 @@ class TestToken(object):
         with pytest.raises(exceptions.ParseError):
             t.parse("ab2")
 
+        # A trailing newline is not part of the match
+        t = token.Token("name", "[a-z]+x?", "")
+        with pytest.raises(exceptions.ParseError):
+            t.parse("abc\n")
+
+    def test_parse_alternation(self):
+        # The whole string must match one of the alternatives
+        t = token.Token("name", "abc|[0-9]+", "")
+        assert t.parse("abc") == "abc"
+        assert t.parse("123") == "123"
+        with pytest.raises(exceptions.ParseError):
+            t.parse("abc1")
+
     def test_regex(self):
         t = token.Token("name", "[a-zA-Z]+", "")
         assert t.regex() == "[a-zA-Z]+"
@@ -88,9 +107,15 @@ class TestIntToken(object):
         with pytest.raises(exceptions.ParseError):
             t.parse("12a")
 
+        # Only ASCII digits match the default regex
+        with pytest.raises(exceptions.ParseError):
+            t.parse("\uff11\uff12")
+
     def test_value_from_parsed_string(self):
         t = token.IntToken("name")
         assert t.value_from_parsed_string("123") == 123
+        assert t.value_from_parsed_string("007") == 7
+        assert t.value_from_parsed_string("12345") == 12345
 
         with pytest.raises(exceptions.ParseError):
             t.value_from_parsed_string("abc")
@@ -126,6 +151,41 @@ class TestStringToken(object):
         t = token.StringToken("name")
         assert t.parse("abc") == "abc"
 
+        # Only ASCII letters match the default regex
+        for string in ("", "ab1", "caf\u00e9"):
+            with pytest.raises(exceptions.ParseError):
+                t.parse(string)
+
     def test_value_from_parsed_string(self):
         t = token.StringToken("name")
         assert t.value_from_parsed_string("abc") == "abc"
+
+
+@pytest.mark.parametrize(
+    "token_obj, string, expected",
+    [
+        (token.IntToken("i"), "012", 12),
+        (token.IntToken("i", regex="[0-9]{3,}"), "012", 12),
+        (token.StringToken("s"), "abc", "abc"),
+        (token.StringToken("s", regex="[a-z][a-zA-Z]+"), "abCd", "abCd"),
+        (token.StringToken("s", regex="[A-Z][a-zA-Z]{1,}"), "AbCd", "AbCd"),
+        (token.Token("t", "one|two", "s"), "two", "two"),
+    ],
+)
+def test_pickle(token_obj, string, expected):
+    # Parse first so any lazily compiled pattern is pickled as well
+    token_obj.parse(string)
+    loaded = pickle.loads(pickle.dumps(token_obj))
+    assert repr(loaded) == repr(token_obj)
+    assert loaded.parse(string) == expected
+
+
+def test_pickle__template():
+    template_obj = template.Template(
+        "name",
+        [token.StringToken("s", regex="[a-z][a-zA-Z]+"), "_v", token.IntToken("i")],
+    )
+    assert template_obj.parse("abCd_v012") == {"s": "abCd", "i": 12}
+    loaded = pickle.loads(pickle.dumps(template_obj))
+    assert loaded.parse("abCd_v012") == {"s": "abCd", "i": 12}
+
@@ -1,3 +1,5 @@
+import re
+
 import pytest
 
 from templater import constants, exceptions, template, token, util
@@ -22,6 +24,12 @@ def test_get_case_regex__invalid():
     assert str(exc_info.value) == "Unknown case: invalid"
 
 
+def test_compile_regex():
+    pattern = util.compile_regex(r"\w+_\d+")
+    assert pattern.fullmatch("abc_123")
+    assert util.compile_regex(r"\w+_\d+") is pattern
+
+
 @pytest.mark.parametrize(
     "padmin, padmax, expected",
     [(None, None, "+"), (3, None, "{3,}"), (None, 3, "{,3}"), (2, 5, "{2,5}")],
@@ -44,6 +52,39 @@ def test_get_regex_padding__invalid_range():
     assert str(exc_info.value) == "Padmax cannot be less than 0: -2"
 
 
+@pytest.mark.parametrize(
+    "regex",
+    [
+        "[0-9]+",
+        "[a-zA-Z]+",
+        "[a-z]{2,}",
+        "[A-Z]{,3}",
+        "[0-9]{2,3}",
+        "[a-zA-Z]{3,3}",
+        "[a-z][a-zA-Z]+",
+        "[A-Z][a-zA-Z]{,2}",
+        "[A-Z][a-zA-Z]{1,2}",
+        "ab|abcd|12",
+        "123",
+    ],
+)
+def test_get_regex_validator(regex):
+    validator = util.get_regex_validator(regex)
+    assert validator is not None
+    strings = ["", "1", "12", "123", "1234", "a", "ab", "AB", "aB", "Ab", "Abc", "abcd"]
+    # Non-ASCII letters and digits
+    strings += ["\u00e9", "\uff11"]
+    for string in strings:
+        assert validator(string) == bool(re.fullmatch(regex, string)), string
+
+
+@pytest.mark.parametrize(
+    "regex", [".+", "[b-y][a-zA-Z]+", "[0-9]{3,1}", "[0-9]{,}", "[b-y]+", "a|b.", "a|"]
+)
+def test_get_regex_validator__unsupported(regex):
+    assert util.get_regex_validator(regex) is None
+
+
 @pytest.mark.parametrize(
     "string, expected_format",
     [